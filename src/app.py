@@ -1,21 +1,40 @@
 import sys
+import atexit
 import argparse
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk, messagebox
 import tkinter.font as tkFont
 from pathlib import Path
 from datetime import datetime
+from dataclasses import dataclass
+import time
 import subprocess
 import platform
 import threading
 import queue
 import traceback
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import fnmatch
+import re
 import os
+import io
+import shutil
 import json
 import tarfile
 import sqlite3
 
+try:
+    import orjson  # optional: faster config (de)serialization
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard  # optional: multi-threaded backup compression (.tar.zst)
+except ImportError:
+    zstandard = None
+
 # ==============================================================================
 # 0. PYTHONW SAFETY CHECK
 # ==============================================================================
@@ -33,18 +52,18 @@ APP_DIR = Path(__file__).resolve().parent
 DEFAULT_ROOT_DIR = APP_DIR
 
 # --- Exclusions ---
-EXCLUDED_FOLDERS = {
+EXCLUDED_FOLDERS = frozenset({
     "node_modules", ".git", "__pycache__", ".venv", ".mypy_cache",
     "_logs", "dist", "build", ".vscode", ".idea", "target", "out",
     "bin", "obj", "Debug", "Release", "logs", "venv"
-}
+})
 PREDEFINED_EXCLUDED_FILENAMES = {
     "package-lock.json", "yarn.lock", ".DS_Store", "Thumbs.db",
     "*.pyc", "*.pyo", "*.swp", "*.swo"
 }
 
 # --- Binary Extensions (for skipping in dump) ---
-FORCE_BINARY_EXTENSIONS_FOR_DUMP = {
+FORCE_BINARY_EXTENSIONS_FOR_DUMP: frozenset[str] = frozenset({
     ".tar.gz", ".gz", ".zip", ".rar", ".7z", ".bz2", ".xz", ".tgz",
     ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".tif", ".tiff",
     ".mp3", ".wav", ".ogg", ".flac", ".aac", ".m4a",
@@ -55,15 +74,53 @@ FORCE_BINARY_EXTENSIONS_FOR_DUMP = {
     ".pyc", ".pyo", ".class", ".jar", ".wasm",
     ".ttf", ".otf", ".woff", ".woff2",
     ".iso", ".img", ".bin", ".bak", ".data", ".asset", ".pak"
-}
+})
+
+# --- Tree Scan ---
+# Folder listings are I/O bound (scandir releases the GIL), so oversubscribe the cores
+TREE_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+TREE_MAP_WRITE_BUFFER_BYTES = 1 << 16  # folder tree map lines stream straight to disk
+
+# --- Dump Pipeline ---
+MAX_DUMP_FILE_BYTES = 1_000_000  # larger files are skipped (with a warning) by dump/export
+# Reads are I/O bound (readall releases the GIL); the read-ahead window caps what they hold
+DUMP_READ_WORKERS = min(16, (os.cpu_count() or 1) * 4)  # concurrent reads feeding the single writer
+DUMP_READ_AHEAD = 64             # max files read but not yet written (bounds memory)
+DUMP_READ_AHEAD_BYTES = 16 << 20 # ...or this many source bytes, whichever is hit first
+DUMP_WRITE_BUFFER_BYTES = 1 << 20
+
+# --- Backup Streaming ---
+BACKUP_TAR_BUFSIZE = 1 << 20  # tar stream block size, and its per-member copy chunk
+BACKUP_WRITE_BUFFER_BYTES = 4 << 20
+BACKUP_READ_AHEAD = 64                  # max files read but not yet archived
+BACKUP_READ_AHEAD_BYTES = 32 << 20      # ...or this many bytes, whichever is hit first
+BACKUP_READ_AHEAD_MAX_FILE_BYTES = 4 << 20  # larger files stream through tar.add instead
+BACKUP_ZSTD_LEVEL = 3  # zstd default: faster than gzip -6 at a similar ratio on source trees
+
+# --- Audit Cache ---
+# Per-user cache dir, not APP_DIR: the source tree may be read-only, and a
+# PyInstaller onefile build runs from a temporary extraction dir
+_USER_CACHE_DIR = Path(os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+AUDIT_CACHE_FILE = _USER_CACHE_DIR / "ProjectMapper" / ".audit_cache.json"
+CONDA_ENVIRONMENTS_TXT = Path.home() / ".conda" / "environments.txt"
 
 # --- Log Configuration ---
 LOG_ROOT_NAME = "_logs"
 PROJECT_CONFIG_FILENAME = "_project_mapper_config.json"
+CONFIG_SAVE_DEBOUNCE_SECONDS = 0.3
 
 # --- State Constants ---
 S_CHECKED = "checked"
 S_UNCHECKED = "unchecked"
+# Canonical state objects: loaded config values are mapped onto these so every
+# entry in folder_item_states shares one of two strings instead of its own copy.
+STATE_VALUES = {S_CHECKED: S_CHECKED, S_UNCHECKED: S_UNCHECKED}
+
+# --- GUI Queue ---
+GUI_QUEUE_BATCH = 500            # max callbacks run per drain tick
+GUI_QUEUE_INTERVAL_MS = 16       # poll rate while workers are posting
+GUI_QUEUE_IDLE_MAX_MS = 200      # idle polls back off (doubling) up to this
+LOG_MAX_LINES = 10_000           # log widget keeps only the most recent lines
 
 # --- Theme ---
 THEME = {
@@ -107,32 +164,235 @@ THEME = {
 # 2. HELPER FUNCTIONS (Pure Logic / Stateless)
 # ==============================================================================
 
+def _is_binary_ext(name: str) -> bool:
+    """Extension-only binary check on a bare filename (no PurePath construction).
+
+    Compound suffixes like '.tar.gz' are covered by their last part ('.gz').
+    """
+    i = name.rfind(".")
+    return i >= 0 and name[i:].lower() in FORCE_BINARY_EXTENSIONS_FOR_DUMP
+
+# Bytes that may appear in text; translate(None, _TEXT_CHARS) leaves only control bytes
+_TEXT_CHARS = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7F})
+BINARY_SNIFF_BYTES = 8192
+
+def _looks_binary(sample: bytes) -> bool:
+    """NUL anywhere, or more than a third control bytes (perl -B heuristic)."""
+    if b'\0' in sample:
+        return True
+    return len(sample.translate(None, _TEXT_CHARS)) * 3 > len(sample)
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+def _advise_sequential(fd: int) -> None:
+    """Ask the kernel for aggressive readahead on fd (no-op where unsupported)."""
+    if _HAS_FADVISE:
+        try: os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError: pass
+
 def is_binary(file_path: Path) -> bool:
-    """Check if a file is binary by reading the first chunk."""
+    """Check if a file is binary by sniffing the first chunk."""
     try:
-        with open(file_path, 'rb') as f:
-            return b'\0' in f.read(1024)
+        with open(file_path, 'rb', buffering=0) as f:
+            _advise_sequential(f.fileno())
+            return _looks_binary(f.read(BINARY_SNIFF_BYTES))
     except (IOError, PermissionError):
         return True
     except Exception:
         return True
 
-def get_folder_size_bytes(folder_path: Path) -> int:
-    """Recursively calculate folder size."""
+@lru_cache(maxsize=8192)
+def is_binary_cached(path_str: str, mtime_ns: int, size: int) -> bool:
+    """is_binary, remembered per (path, mtime_ns, size) so an edit re-sniffs the file."""
+    return is_binary(Path(path_str))
+
+def get_folder_size_bytes(folder_path: str, cache: dict[str, int]) -> int:
+    """Recursively calculate folder size.
+
+    cache maps folder path -> total bytes and is owned by the caller for one
+    operation, so sizing a folder and then each of its subfolders walks the
+    tree once.
+    """
+    key = str(folder_path)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+
     total_size = 0
     try:
-        for entry in os.scandir(folder_path):
-            if entry.is_file(follow_symlinks=False):
-                try: total_size += entry.stat(follow_symlinks=False).st_size
-                except OSError: pass
-            elif entry.is_dir(follow_symlinks=False):
-                try: total_size += get_folder_size_bytes(Path(entry.path))
-                except OSError: pass
-    except OSError: pass
+        with os.scandir(key) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    try: total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError: pass
+                elif entry.is_dir(follow_symlinks=False):
+                    total_size += get_folder_size_bytes(entry.path, cache)
+    except OSError:
+        return total_size
+    cache[key] = total_size
     return total_size
 
+def read_text_for_dump(file_path: str | Path) -> tuple[str | None, str | None]:
+    """Read one dump candidate (runs on the dump reader pool).
+
+    Returns (content, None) for text, (None, error) when the file could not be
+    read, and (None, None) when its content turns out to be binary. Size and
+    extension filtering happen before a read is queued.
+
+    One open and one read: the binary sniff looks at the head of the bytes
+    already in hand instead of reopening the file.
+    """
+    try:
+        with open(file_path, "rb", buffering=0) as f_in:
+            _advise_sequential(f_in.fileno())
+            raw = f_in.readall()
+    except Exception as e:
+        return None, str(e)
+    if _looks_binary(raw[:BINARY_SNIFF_BYTES]):
+        return None, None
+    # Same result as text mode with universal newlines
+    text = raw.decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n"), None
+
+def read_file_bytes(file_path: str) -> bytes:
+    """Whole-file read for the backup read-ahead pool (errors propagate to the caller)."""
+    with open(file_path, "rb", buffering=0) as f:
+        _advise_sequential(f.fileno())
+        return f.readall()
+
+# Helper processes never get a console window (flag only exists on Windows)
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Subprocess audit outputs: key -> (mtime of the invalidating path, stdout)
+_audit_cache: dict[str, tuple[float, str]] = {}
+
+def cached_audit(key: str, mtime_source: Path | None, cmd: list[str]) -> str:
+    """Run an audit command, reusing its last output while mtime_source is unchanged.
+
+    Without a readable mtime_source the command always runs and nothing is cached.
+    """
+    mtime = None
+    if mtime_source is not None:
+        try: mtime = os.stat(mtime_source).st_mtime
+        except OSError: mtime = None
+
+    hit = _audit_cache.get(key)
+    if mtime is not None and hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    res = subprocess.run(cmd, capture_output=True, text=True,
+                         stdin=subprocess.DEVNULL, creationflags=_NO_WINDOW)
+    if mtime is not None and res.returncode == 0:
+        _audit_cache[key] = (mtime, res.stdout)
+    return res.stdout
+
+_conda_exe: str | None = None
+
+def conda_executable() -> str | None:
+    """Full path of the conda executable, looked up once per session.
+
+    Running it directly skips the shell that used to resolve 'conda' (conda.bat
+    on Windows) for every audit command. A failed lookup is retried next call.
+    """
+    global _conda_exe
+    if _conda_exe is None:
+        _conda_exe = os.environ.get("CONDA_EXE") or shutil.which("conda")
+    return _conda_exe
+
+def load_audit_cache(path: Path = AUDIT_CACHE_FILE):
+    """Best-effort restore of the audit cache from a previous session."""
+    try:
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+        for k, (mtime, out) in data.items():
+            _audit_cache[k] = (float(mtime), str(out))
+    except Exception: pass
+
+def save_audit_cache(path: Path = AUDIT_CACHE_FILE):
+    """Best-effort persist of the audit cache for the next session."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f: json.dump(_audit_cache, f)
+    except Exception: pass
+
+def compile_filename_patterns(patterns) -> re.Pattern | None:
+    """Compile glob-style filename patterns into a single alternation regex.
+
+    Mirrors fnmatch.fnmatch semantics, including case-insensitive matching on
+    platforms where os.path.normcase folds case (Windows).
+    """
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in sorted(patterns)), flags)
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+def compile_filename_matcher(patterns):
+    """Compile glob-style filename patterns into one is_excluded(name) test.
+
+    Literal names go into a frozenset and '*<literal>' patterns (e.g. '*.pyc')
+    into a suffix tuple checked by a single str.endswith call; only the
+    remaining globs go through compile_filename_patterns. Case folding follows
+    the same platform rule. Returns None when there are no patterns.
+    """
+    if not patterns:
+        return None
+    fold = os.path.normcase("A") == "a"
+    exact, suffixes, globs = set(), set(), []
+    for p in patterns:
+        key = p.lower() if fold else p
+        if not _GLOB_CHARS.search(p):
+            exact.add(key)
+        elif p[0] == "*" and not _GLOB_CHARS.search(p, 1):
+            suffixes.add(key[1:])
+        else:
+            globs.append(p)
+    exact = frozenset(exact)
+    suffixes = tuple(sorted(suffixes))
+    rx = compile_filename_patterns(globs)
+    rx_match = rx.match if rx is not None else None
+
+    def is_excluded(name: str) -> bool:
+        if fold:
+            name = name.lower()
+        if name in exact or name.endswith(suffixes):
+            return True
+        return rx_match is not None and rx_match(name) is not None
+    return is_excluded
+
+_last_ts_sec = 0
+_last_ts_str = ""
+
+def _now_ts() -> str:
+    """'[HH:MM:SS]' for log lines, formatted at most once per wall-clock second."""
+    global _last_ts_sec, _last_ts_str
+    sec = int(time.time())
+    if sec != _last_ts_sec:
+        _last_ts_str = time.strftime("[%H:%M:%S]", time.localtime(sec))
+        _last_ts_sec = sec
+    return _last_ts_str
+
+def build_name_filter(excluded_dirnames: frozenset[str], is_excluded_file):
+    """Specialize the per-entry name test for one exclusion configuration.
+
+    Returns should_include(name, is_dir) with the folder set and the filename
+    matcher captured as closure constants, so the scan loop does no attribute,
+    global or None lookups per entry. Rebuild on every config change.
+    """
+    if is_excluded_file is None:
+        def should_include(name: str, is_dir: bool) -> bool:
+            return not is_dir or name not in excluded_dirnames
+        return should_include
+
+    def should_include(name: str, is_dir: bool) -> bool:
+        if is_dir:
+            return name not in excluded_dirnames
+        return not is_excluded_file(name)
+    return should_include
+
+@lru_cache(maxsize=4096)
 def format_display_size(size_bytes: int) -> str:
-    """Format bytes into readable string."""
+    """Format bytes into readable string (memoized: small sizes repeat a lot across a tree)."""
     if size_bytes < 1024: return f"{size_bytes} B"
     size_kb = size_bytes / 1024
     if size_kb < 1024: return f"{size_kb:.1f} KB"
@@ -141,6 +401,22 @@ def format_display_size(size_bytes: int) -> str:
     size_gb = size_mb / 1024
     return f"{size_gb:.2f} GB"
 
+@dataclass(frozen=True, slots=True)
+class ProjectLayout:
+    """Every path derived from a project root."""
+    root: str
+    logs_dir: str
+    config_path: str
+
+    @classmethod
+    def for_root(cls, root: Path) -> "ProjectLayout":
+        logs_dir = os.path.join(str(root), LOG_ROOT_NAME)
+        return cls(
+            root=str(root),
+            logs_dir=logs_dir,
+            config_path=os.path.join(logs_dir, PROJECT_CONFIG_FILENAME),
+        )
+
 # ==============================================================================
 # 3. GUI COMPONENTS & PROGRESS POPUP
 # ==============================================================================
@@ -222,6 +498,14 @@ class ProjectMapperApp:
 
         # Application State
         self.folder_item_states = {}
+        # iid -> (row text, navigable) as inserted by the last scan; lets the
+        # tree repaint and route clicks without touching the filesystem
+        self.tree_item_meta = {}
+        self._lazy_tree_dirs = {}  # not-yet-expanded folder iid -> its placeholder child's iid
+        self._pending_tree_rows = {}  # scanned folder iid -> its rows, inserted on first expand
+        # Effective (ancestor-aware) selection per path string; replaced, never
+        # mutated, on invalidation so in-flight workers can't repopulate it stale
+        self._selected_cache = {}
         self.dynamic_global_excluded_filenames = set()
 
         # .gitignore support (best-effort, simple patterns)
@@ -231,11 +515,41 @@ class ProjectMapperApp:
 
         self.running_tasks = set()
         self._tree_is_ready = False
+        self._respect_exclusions = True
+
+        # Conda env name -> env prefix path (filled by _load_conda_info_impl)
+        self.conda_env_paths = {}
+
+        # External compressor for gzip backups (pigz is multi-core); None -> in-process gzip.
+        # Unused when zstandard is installed: backups are then .tar.zst
+        self.external_gzip = shutil.which("pigz") or shutil.which("gzip")
         
         # Threading Safety
         self.state_lock = threading.RLock()
         self.stop_event = threading.Event()
 
+        # Combined filename matcher (predefined + dynamic + .gitignore bare patterns)
+        # and the name-level include test specialized from it
+        self._excluded_filename_match = None
+        self._gitignore_file_rx = None
+        self._gitignore_dir_rx = None
+        self._name_filter = None
+        self._rebuild_exclusion_matchers()
+
+        # Config persistence (debounced, atomic, skipped when unchanged)
+        self._states_root = None  # resolved root that folder_item_states belongs to
+        self._config_save_lock = threading.Lock()
+        self._config_write_lock = threading.Lock()
+        self._config_save_timer = None
+        self._last_config_blob = None
+
+        # Memoized resolved roots (reset on every rescan)
+        self._resolved_roots = {}
+
+        # Log lines waiting for the next GUI tick (bounded like the log widget itself)
+        self._log_buffer = deque(maxlen=LOG_MAX_LINES)
+        self._log_status = ""
+
         # References
         self.widgets = {}
         self.current_progress_popup = None
@@ -262,6 +576,7 @@ class ProjectMapperApp:
 
         self._setup_styles()
         self._setup_ui()
+        self._gui_queue_delay = GUI_QUEUE_INTERVAL_MS
         self.process_gui_queue()
         
         self._activity_blinker()
@@ -288,10 +603,14 @@ class ProjectMapperApp:
         style = ttk.Style()
         if "clam" in style.theme_names(): style.theme_use("clam")
         
-        self.default_ui_font = "Arial"
-        if "DejaVu Sans" in tkFont.families(): self.default_ui_font = "DejaVu Sans"
-
-        tree_font = tkFont.Font(family=self.default_ui_font, size=11)
+        # Ask Tk what the preferred family resolves to (one call) instead of
+        # enumerating every installed font with tkFont.families()
+        tree_font = tkFont.Font(family="DejaVu Sans", size=11)
+        if tree_font.actual("family") == "DejaVu Sans":
+            self.default_ui_font = "DejaVu Sans"
+        else:
+            self.default_ui_font = "Arial"
+            tree_font.configure(family=self.default_ui_font)
         
         self.widgets['tree_bg_normal'] = THEME["tree_bg"]
         self.widgets['tree_bg_disabled'] = THEME["tree_bg_disabled"]
@@ -389,8 +708,10 @@ class ProjectMapperApp:
         
         self.widgets['folder_tree'].pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.widgets['folder_tree_vsb'] = vsb
         self.widgets['folder_tree'].bind("<ButtonRelease-1>", self.on_tree_item_click)
         self.widgets['folder_tree'].bind("<FocusOut>", self._on_tree_focus_out)
+        self.widgets['folder_tree'].bind("<<TreeviewOpen>>", self._on_tree_open)
         
         paned.add(left_frame, weight=3) # Give tree more initial weight
 
@@ -410,8 +731,11 @@ class ProjectMapperApp:
             ("Audit System Info", self.audit_system_impl, False)
         ]
 
+        n_cols = 4  # Spread buttons horizontally
         for idx, (lbl, func, save) in enumerate(actions):
-            r, c = divmod(idx, 4) # Spread buttons horizontally
+            r, c = divmod(idx, n_cols)
+            task_id = lbl.split()[0].lower()
+            # Every option, command included, goes in the one create call
             b = tk.Button(
                 btn_grid,
                 text=lbl,
@@ -421,12 +745,12 @@ class ProjectMapperApp:
                 activeforeground=THEME["text"],
                 font=("Arial", 11, "bold"),
                 pady=8,
+                command=lambda f=func, t=task_id, s=save: self.run_threaded_action(f, task_id=t, save_config_after=s, use_popup=True),
             )
-            task_id = lbl.split()[0].lower()
-            b.config(command=lambda f=func, t=task_id, s=save: self.run_threaded_action(f, task_id=t, save_config_after=s, use_popup=True))
             b.grid(row=r, column=c, sticky="ew", padx=5, pady=5)
-            btn_grid.columnconfigure(c, weight=1)
             self.widgets['buttons'][task_id] = b
+        for c in range(min(n_cols, len(actions))):
+            btn_grid.columnconfigure(c, weight=1)
 
         # Controls & Utility Section
         util_frame = tk.Frame(right_frame, bg=THEME["panel_bg"])
@@ -459,6 +783,7 @@ class ProjectMapperApp:
             activeforeground=THEME["text"],
         )
         excl_chk.pack(side=tk.LEFT, padx=10)
+        self.widgets['respect_exclusions'].trace_add("write", self._on_respect_exclusions_changed)
 
         # -- Conda --
         tk.Label(util_frame, text="| Env:", bg=THEME["panel_bg"], fg=THEME["muted_text"]).pack(side=tk.LEFT)
@@ -611,31 +936,60 @@ class ProjectMapperApp:
         threading.Thread(target=thread_target_wrapper, daemon=True).start()
 
     def schedule_log_message(self, msg: str, level: str = "INFO"):
-        self.gui_queue.put(lambda: self.log_message(msg, level))
-        def _update_popup_safely():
-            if self.current_progress_popup:
-                self.current_progress_popup.update_text(f"[{level}] {msg}")
-        self.gui_queue.put(_update_popup_safely)
+        # A plain (msg, level) tuple; process_gui_queue logs it and mirrors it to the popup
+        self.gui_queue.put((msg, level))
 
     def log_message(self, msg: str, level: str = "INFO"):
-        ts = datetime.now().strftime("[%H:%M:%S]")
-        full_msg = f"{ts} [{level}] {msg}\n"
+        """Buffer a log line (Tk thread only); _flush_log_buffer writes it on the next tick."""
+        ts = _now_ts()
+        self._log_buffer.append(f"{ts} [{level}] {msg}\n")
+        self._log_status = f"{ts} {msg}"
+
+    def _flush_log_buffer(self):
+        """One Text insert for every line buffered since the last tick, then trim to LOG_MAX_LINES."""
+        if not self._log_buffer:
+            return
+        text = "".join(self._log_buffer)
+        self._log_buffer.clear()
         lb = self.widgets.get('log_box')
         if lb:
             lb.config(state=tk.NORMAL)
-            lb.insert(tk.END, full_msg)
+            lb.insert(tk.END, text)
+            n_lines = int(lb.index("end-1c").split(".")[0])
+            if n_lines > LOG_MAX_LINES:
+                lb.delete("1.0", f"{n_lines - LOG_MAX_LINES + 1}.0")
             lb.config(state=tk.DISABLED)
             lb.see(tk.END)
-        self.widgets['status_var'].set(f"{ts} {msg}")
+        self.widgets['status_var'].set(self._log_status)
 
     def process_gui_queue(self):
-        while not self.gui_queue.empty():
+        # Bounded batch per tick: a flood from worker threads can't starve Tk's own events.
+        # Items are callables, or (msg, level) tuples from schedule_log_message.
+        popup_lines = []
+        drained = 0
+        for _ in range(GUI_QUEUE_BATCH):
+            try: item = self.gui_queue.get_nowait()
+            except queue.Empty: break
+            drained += 1
             try:
-                cb = self.gui_queue.get_nowait()
-                try: cb()
-                except Exception: pass
-            except queue.Empty: pass
-        self.root.after(100, self.process_gui_queue)
+                if type(item) is tuple:
+                    msg, level = item
+                    self.log_message(msg, level)
+                    popup_lines.append(f"[{level}] {msg}")
+                else:
+                    item()
+            except Exception: pass
+        popup = self.current_progress_popup
+        if popup and popup_lines:
+            try: popup.update_text("\n".join(popup_lines))
+            except Exception: pass
+        self._flush_log_buffer()
+        # Poll fast while work is arriving; back off while the queue stays empty
+        if drained:
+            self._gui_queue_delay = GUI_QUEUE_INTERVAL_MS
+        else:
+            self._gui_queue_delay = min(GUI_QUEUE_IDLE_MAX_MS, self._gui_queue_delay * 2)
+        self.root.after(self._gui_queue_delay, self.process_gui_queue)
 
     # --- Project Management Logic ---
     def _on_choose_project_directory(self):
@@ -663,13 +1017,15 @@ class ProjectMapperApp:
     def _rescan_project_tree(self):
         path = self._get_current_project_path()
         tree = self.widgets['folder_tree']
-        for i in tree.get_children(): tree.delete(i)
+        tree.delete(*tree.get_children())
         
         if not path:
             tree.insert("", "end", text="Invalid Root Path")
             return
             
         tree.insert("", "end", text="Scanning...")
+        self._flush_config_save()
+        self._resolved_roots.clear()
         self.run_threaded_action(lambda: self._initial_tree_load_impl(path), task_id='load_tree')
 
     def _navigate_tree_to_path(self, target_path: Path):
@@ -701,119 +1057,174 @@ class ProjectMapperApp:
     def _on_tree_focus_out(self, _event):
         self.root.after(1, self._clear_active_tree_row)
 
+    def _list_tree_dir(self, dir_str: str, scan_root: Path):
+        """Scandir one folder: non-excluded (is_dir, entry, size) rows, folders first (case insensitive).
+
+        Files carry their own size; folder sizes are summed from these after the scan.
+        """
+        def _entry_size(e) -> int:
+            try:
+                return e.stat(follow_symlinks=False).st_size if e.is_file(follow_symlinks=False) else 0
+            except OSError:
+                return 0
+
+        try:
+            with os.scandir(dir_str) as it:
+                entries = [(e.is_dir(follow_symlinks=False), e) for e in it]
+        except OSError:
+            return []
+        entries.sort(key=lambda t: (not t[0], t[1].name.lower()))
+        return [
+            (d, e, 0 if d else _entry_size(e))
+            for d, e in entries
+            if not self.should_exclude_entry(e, d, scan_root)
+        ]
+
+    def _make_tree_row(self, is_dir: bool, entry, size: int, parent_iid: str) -> dict:
+        """Fully formatted tree row (text, glyph state, nav arrows, size) for one listed entry."""
+        # scandir under the resolved root already yields canonical absolute paths.
+        # Interned: the same string then serves as state key, meta key and Tk iid,
+        # and a key loaded from the config is that very object too.
+        path_str = sys.intern(entry.path)
+
+        # State Inheritance
+        # If we don't have a specific state saved, inherit from parent
+        if path_str not in self.folder_item_states:
+            parent_state = self.folder_item_states.get(parent_iid, S_CHECKED)
+            with self.state_lock:
+                self.folder_item_states[path_str] = parent_state
+
+        if is_dir:
+            row = {'parent': parent_iid, 'iid': path_str, 'text': f" {entry.name}", 'nav': True}
+        else:
+            # A symlink to a folder is listed as a leaf but still navigable
+            try: is_file, nav = entry.is_file(), entry.is_dir()
+            except OSError: is_file, nav = False, False
+            row = {'parent': parent_iid, 'iid': path_str, 'text': f" {'📄 ' if is_file else ''}{entry.name}", 'nav': nav}
+            row['size'] = format_display_size(size)
+        row['state'] = self.folder_item_states[path_str]
+        return row
+
     def _initial_tree_load_impl(self, root_path: Path):
         with self.state_lock:
             self.folder_item_states.clear()
+            self._invalidate_selection_cache()
+            self._states_root = str(root_path.resolve())
         
         self.load_project_config(root_path)
         tree_data = []
 
-        def _recurse(current: Path, parent_iid: str):
-            if self.stop_event.is_set(): return
-            try:
-                # LIST ALL ITEMS (Files + Folders)
-                # Sort: Folders first, then files (case insensitive)
-                items = sorted(list(current.iterdir()), key=lambda x: (not x.is_dir(), x.name.lower()))
-                
-                for p in items:
-                    # 1. SAFETY: Skip Excluded Folders/Files immediately
-                    if self.should_exclude_path(p, root_path):
-                        continue
+        root_str = sys.intern(str(root_path.resolve()))
+        scan_root = Path(root_str)
+
+        # Fan out: each folder listing is one task; a finished listing submits its subfolders.
+        # os.scandir releases the GIL, so several directory reads stay in flight at once.
+        # Every folder is listed, so sizes are complete; rows below folders saved as
+        # unchecked are inserted on first expand like any other deferred rows.
+        listings = {}
+        with ThreadPoolExecutor(max_workers=TREE_SCAN_WORKERS, thread_name_prefix="tree_scan") as pool:
+            pending = {pool.submit(self._list_tree_dir, root_str, scan_root): root_str}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    children = listings[pending.pop(fut)] = fut.result()
+                    if self.stop_event.is_set(): continue
+                    for is_dir, e, _ in children:
+                        if is_dir:
+                            pending[pool.submit(self._list_tree_dir, e.path, scan_root)] = e.path
 
-                    path_str = str(p.resolve())
-                    
-                    # 2. State Inheritance
-                    # If we don't have a specific state saved, inherit from parent
-                    if path_str not in self.folder_item_states:
-                        parent_state = self.folder_item_states.get(parent_iid, S_CHECKED)
-                        with self.state_lock:
-                            self.folder_item_states[path_str] = parent_state
-                    
-                    # 3. Add to Tree Data
-                    # We add a visual prefix for files since we are using the image slot for the checkbox
-                    display_text = f" {p.name}"
-                    
-                    tree_data.append({
-                        'parent': parent_iid, 
-                        'iid': path_str, 
-                        'text': display_text
-                    })
-                    
-                    # 4. Recurse only if Directory
-                    if p.is_dir():
-                        _recurse(p, path_str)
-                        
-            except PermissionError: pass
-
-        root_str = str(root_path.resolve())
         with self.state_lock: self.folder_item_states[root_str] = S_CHECKED
-        tree_data.append({'parent': '', 'iid': root_str, 'text': f" {root_path.name}", 'open': True})
-        
-        _recurse(root_path, root_str)
+        # Rows leave the worker fully formatted (text, glyph state, nav arrows, size),
+        # so the Tk thread only inserts them; no per-row stat on the GUI thread
+        root_row = {'parent': '', 'iid': root_str, 'text': f" {scan_root.name}", 'state': S_CHECKED, 'nav': True, 'open': True}
+        tree_data.append(root_row)
+
+        # Assemble depth-first, pre-order from the listings: deterministic order,
+        # and parents always precede their children in tree_data
+        totals = {root_str: 0}
+        dir_rows = []
+        stack = [(d, e, sz, root_str) for d, e, sz in reversed(listings.get(root_str, []))]
+        while stack:
+            if self.stop_event.is_set(): break
+            is_dir, entry, size, parent_iid = stack.pop()
+            row = self._make_tree_row(is_dir, entry, size, parent_iid)
+            tree_data.append(row)
+            path_str = row['iid']
+
+            if not is_dir:
+                totals[parent_iid] += size
+            else:
+                totals[path_str] = 0
+                dir_rows.append((row, path_str, parent_iid))
+                stack.extend((d, e, sz, path_str) for d, e, sz in reversed(listings.get(path_str, ())))
+
+        # Post-order roll-up: reversed pre-order visits every folder after its subfolders
+        for row, key, parent_key in reversed(dir_rows):
+            row['size'] = format_display_size(totals[key])
+            totals[parent_key] += totals[key]
+        root_row['size'] = format_display_size(totals[root_str])
+
+        self._invalidate_selection_cache()
         self.gui_queue.put(lambda: self._populate_tree(tree_data))
-    def _populate_tree(self, data):
-        tree = self.widgets['folder_tree']
-        for i in tree.get_children(): tree.delete(i)
-        for d in data:
+
+    def _insert_tree_rows(self, tree, rows):
+        """Insert formatted rows (parents before children).
+
+        An open row's scanned children go in with it; any other folder with
+        scanned children gets a placeholder until it is expanded.
+        """
+        icons = self.icon_imgs
+        meta = self.tree_item_meta
+        lazy = self._lazy_tree_dirs
+        pending = self._pending_tree_rows
+        states = self.folder_item_states
+        for d in rows:
+            iid = d['iid']
+            meta[iid] = (d['text'], d['nav'])
+            nav = ("↑", "↓") if d['nav'] else ("", "")
+            # Current state, not the scan-time one: rows can wait a while before insertion
             tree.insert(
                 d['parent'],
                 "end",
-                iid=d['iid'],
+                iid=iid,
                 text=d['text'],
+                image=icons.get(states.get(iid, d['state']), icons[S_UNCHECKED]),
                 open=d.get('open', False),
-                values=("", "", "..."),
+                values=(*nav, d.get('size', "")),
             )
-            tree.set(d['iid'], "size", "...")
-        
-        self.refresh_tree_visuals()
-        root_path = self._get_current_project_path()
-        if root_path:
-             threading.Thread(target=self._calc_sizes_async, args=(str(root_path),), daemon=True).start()
+            if d.get('open'):
+                self._insert_tree_rows(tree, pending.pop(iid, ()))
+            elif iid in pending:
+                # The placeholder only makes the folder expandable; _on_tree_open replaces it
+                lazy[iid] = tree.insert(iid, "end", text=" …")
 
-    def _calc_sizes_async(self, root_iid):
-        tree = self.widgets['folder_tree']
-        q = [root_iid]
-        while q:
-            if self.stop_event.is_set(): break
-            iid = q.pop(0)
-            try:
-                if not tree.exists(iid): continue
-                sz = get_folder_size_bytes(Path(iid))
-                fmt = format_display_size(sz)
-                self.gui_queue.put(lambda i=iid, s=fmt: (tree.set(i, "size", s), self.refresh_tree_visuals(i)))
-                q.extend(tree.get_children(iid))
-            except: pass
-
-    def refresh_tree_visuals(self, start_node=None):
+    def _populate_tree(self, data):
         tree = self.widgets['folder_tree']
-        def _refresh(iid):
-            if not tree.exists(iid): return
-            with self.state_lock:
-                st = self.folder_item_states.get(iid, S_UNCHECKED)
-            
-            # Use Checkbox Icon
-            icon = self.icon_imgs.get(st, self.icon_imgs[S_UNCHECKED])
-            
-            # Add File/Folder distinction to text
-            p = Path(iid)
-            prefix = "📄 " if p.is_file() else "" 
-            
-            tree.item(iid, text=f" {prefix}{p.name}", image=icon)
-            if p.is_dir():
-                tree.set(iid, "nav_up", "↑")
-                tree.set(iid, "nav_down", "↓")
-            else:
-                tree.set(iid, "nav_up", "")
-                tree.set(iid, "nav_down", "")
-            
-            # Recursion only needed for folders (files have no children)
-            if tree.get_children(iid):
-                for child in tree.get_children(iid): _refresh(child)
-        
-        if start_node: _refresh(start_node)
-        else:
-            root = self._get_current_project_path()
-            if root: _refresh(str(root.resolve()))
+        # Detach from the geometry manager during the bulk insert so Tk doesn't
+        # recompute layout/scrollbars per row; reattach once at the end.
+        tree.pack_forget()
+        self.tree_item_meta = {}
+        self._lazy_tree_dirs = {}
+        # Only the root and its open levels are inserted now; deeper rows wait
+        # in _pending_tree_rows until their folder is first expanded
+        pending = self._pending_tree_rows = {}
+        for d in data[1:]:
+            pending.setdefault(d['parent'], []).append(d)
+        try:
+            tree.delete(*tree.get_children())
+            self._insert_tree_rows(tree, data[:1])
+        finally:
+            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, before=self.widgets['folder_tree_vsb'])
+
+    def _on_tree_open(self, event):
+        """Insert a folder's scanned rows the first time it is expanded."""
+        tree = event.widget
+        iid = tree.focus()
+        placeholder = self._lazy_tree_dirs.pop(iid, None)
+        if placeholder is None:
+            return
+        tree.delete(placeholder)
+        self._insert_tree_rows(tree, self._pending_tree_rows.pop(iid, ()))
 
     def _get_tree_click_action(self, tree, event):
         """Return the explicit control action for a tree click, or None."""
@@ -823,12 +1234,11 @@ class ProjectMapperApp:
 
         element = tree.identify("element", event.x, event.y) or ""
         column = tree.identify_column(event.x)
-        path = Path(iid)
 
         if "image" in element:
             return "toggle_checkbox", iid
 
-        if not path.is_dir():
+        if not self.tree_item_meta.get(iid, ("", False))[1]:
             return None, iid
 
         if column == "#1" and tree.set(iid, "nav_up") == "↑":
@@ -857,7 +1267,10 @@ class ProjectMapperApp:
                 curr = self.folder_item_states.get(iid, S_UNCHECKED)
                 new = S_CHECKED if curr != S_CHECKED else S_UNCHECKED
                 self.folder_item_states[iid] = new
-            self.refresh_tree_visuals(iid)
+                self._invalidate_selection_cache()
+            # Glyphs show each row's own state, so only the clicked row changes
+            self._set_item_icon(iid)
+            self._schedule_config_save()
             return
 
         p = Path(iid)
@@ -870,25 +1283,92 @@ class ProjectMapperApp:
         if action == "navigate_down":
             self._navigate_tree_to_path(p)
 
+    def _set_item_icon(self, iid: str):
+        """Repaint only the checkbox glyph of one row."""
+        with self.state_lock:
+            st = self.folder_item_states.get(iid, S_UNCHECKED)
+        try:
+            self.widgets['folder_tree'].item(iid, image=self.icon_imgs.get(st, self.icon_imgs[S_UNCHECKED]))
+        except tk.TclError:
+            pass
+
     def set_global_selection(self, state):
         with self.state_lock:
-            for k in self.folder_item_states:
-                self.folder_item_states[k] = state
-        self.refresh_tree_visuals()
+            self.folder_item_states.update(dict.fromkeys(self.folder_item_states, state))
+            self._invalidate_selection_cache()
+        self._schedule_config_save()
+
+        # Every row gets the same glyph; no text/nav/stat work needed
+        icon = self.icon_imgs.get(state, self.icon_imgs[S_UNCHECKED])
+        tree = self.widgets['folder_tree']
+        meta = self.tree_item_meta
+        stack = list(tree.get_children())
+        while stack:
+            iid = stack.pop()
+            if iid not in meta: continue  # expand placeholders carry no checkbox
+            tree.item(iid, image=icon)
+            stack.extend(tree.get_children(iid))
+
+    def _resolved_root(self, project_root: Path) -> Path:
+        """project_root.resolve(), memoized until the next rescan."""
+        root = self._resolved_roots.get(project_root)
+        if root is None:
+            root = self._resolved_roots[project_root] = project_root.resolve()
+        return root
 
     def is_selected(self, path: Path, project_root: Path) -> bool:
-        try: p = path.resolve()
-        except: return False
-        root = project_root.resolve()
-        if p != root and not str(p).startswith(str(root)): return False
-        curr = p
+        root = self._resolved_root(project_root)
+        prefix = os.path.join(str(root), "")
+        # Paths built under the resolved root are already canonical; only
+        # relative or foreign-prefixed paths pay for a resolve
+        p = path
+        if not (p.is_absolute() and (p == root or str(p).startswith(prefix))):
+            try: p = path.resolve()
+            except: return False
+        if p != root and not str(p).startswith(prefix): return False
+
+        # Walk up to the first unchecked folder, the root, or a memoized ancestor;
+        # every path visited on the way shares the answer.
+        cache = self._selected_cache
+        curr = str(p)
+        root_str = str(root)
+        visited = []
+        result = True
         while True:
-            st = self.folder_item_states.get(str(curr))
-            if st == S_UNCHECKED: return False
-            if curr == root: return st != S_UNCHECKED
-            if curr.parent == curr: break
-            curr = curr.parent
-        return True
+            hit = cache.get(curr)
+            if hit is not None:
+                result = hit
+                break
+            visited.append(curr)
+            if self.folder_item_states.get(curr) == S_UNCHECKED:
+                result = False
+                break
+            if curr == root_str: break
+            parent = os.path.dirname(curr)
+            if parent == curr: break
+            curr = parent
+        for v in visited: cache[v] = result
+        return result
+
+    def _selected_subdir_key(self, entry, parent_key: str, project_root: Path):
+        """State key of a subfolder of the selected folder parent_key, or None if it is deselected.
+
+        A subfolder's own key is built from its parent's; if it is unchecked the
+        subfolder is out. A symlinked one (its checkbox is stored under the link
+        path) is then resolved and checked with is_selected, so a link to an
+        unchecked folder (or one outside the root) stays out too.
+        """
+        key = os.path.join(parent_key, entry.name)
+        if self.folder_item_states.get(key) == S_UNCHECKED: return None
+        try: is_link = entry.is_symlink()
+        except OSError: is_link = False
+        if is_link:
+            key = os.path.realpath(entry.path)
+            return key if self.is_selected(Path(key), project_root) else None
+        return key
+
+    def _invalidate_selection_cache(self):
+        self._selected_cache = {}
 
     def _load_gitignore_patterns(self, root: Path):
         """Best-effort .gitignore parsing.
@@ -907,6 +1387,7 @@ class ProjectMapperApp:
             self.gitignore_dirnames = set()
             self.gitignore_file_patterns = set()
             self.gitignore_path_patterns = set()
+            self._rebuild_exclusion_matchers()
 
         if not gi.exists():
             return
@@ -947,107 +1428,82 @@ class ProjectMapperApp:
             self.gitignore_dirnames = dirnames
             self.gitignore_file_patterns = file_pats
             self.gitignore_path_patterns = path_pats
+            self._rebuild_exclusion_matchers()
 
-    def _rel_posix(self, p: Path, root: Path) -> str:
-        """Return a posix-style relative path; fall back to name if relative fails."""
-        try:
-            return p.relative_to(root).as_posix()
-        except Exception:
-            return p.name
+    def _rebuild_exclusion_matchers(self):
+        """Recompile the filename matcher; call whenever a pattern source changes."""
+        with self.state_lock:
+            pats = (
+                PREDEFINED_EXCLUDED_FILENAMES
+                | self.dynamic_global_excluded_filenames
+                | self.gitignore_file_patterns
+            )
+            self._excluded_filename_match = compile_filename_matcher(pats)
+            # .gitignore path patterns: files match rel; folders match rel or rel + "/"
+            # against each pattern or pattern + "/" (the old three fnmatch forms)
+            gi_paths = self.gitignore_path_patterns
+            self._gitignore_file_rx = compile_filename_patterns(gi_paths)
+            self._gitignore_dir_rx = compile_filename_patterns(gi_paths | {p + "/" for p in gi_paths})
+            self._name_filter = build_name_filter(
+                EXCLUDED_FOLDERS | self.gitignore_dirnames, self._excluded_filename_match
+            )
 
-    def _respect_exclusions_enabled(self) -> bool:
-        """UI/engine toggle: when False, include everything (verbose mapping)."""
+    def _on_respect_exclusions_changed(self, *_args):
         try:
-            var = self.widgets.get('respect_exclusions')
-            if var is None:
-                return True
-            return bool(var.get())
+            self._respect_exclusions = bool(self.widgets['respect_exclusions'].get())
         except Exception:
-            return True
-
-    def should_exclude_dir(self, dir_path: Path, project_root: Path) -> bool:
-        """Directory exclusion check: hard-coded exclusions + .gitignore (best-effort)."""
-        if not self._respect_exclusions_enabled():
-            return False
-
-        name = dir_path.name
-        if name in EXCLUDED_FOLDERS:
-            return True
+            self._respect_exclusions = True
 
-        rel = self._rel_posix(dir_path, project_root)
-
-        with self.state_lock:
-            if name in self.gitignore_dirnames:
-                return True
-            # Match path patterns against directory relpath
-            for pat in self.gitignore_path_patterns:
-                if fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(rel + "/", pat) or fnmatch.fnmatch(rel + "/", pat + "/"):
-                    return True
-
-        return False
-
-    def should_exclude_file(self, filename: str, rel_posix: str | None = None) -> bool:
-        """File exclusion check: predefined + dynamic + .gitignore (best-effort)."""
-        if not self._respect_exclusions_enabled():
-            return False
-
-        with self.state_lock:
-            pats = PREDEFINED_EXCLUDED_FILENAMES.union(self.dynamic_global_excluded_filenames)
-            gi_files = set(self.gitignore_file_patterns)
-            gi_paths = set(self.gitignore_path_patterns)
-
-        # filename-based patterns
-        if any(fnmatch.fnmatch(filename, p) for p in pats):
-            return True
-        if any(fnmatch.fnmatch(filename, p) for p in gi_files):
-            return True
-
-        # relative-path patterns (if available)
-        if rel_posix:
-            rel_posix = rel_posix.replace("\\", "/")
-            for pat in gi_paths:
-                if fnmatch.fnmatch(rel_posix, pat):
-                    return True
+    def _respect_exclusions_enabled(self) -> bool:
+        """UI/engine toggle: when False, include everything (verbose mapping).
 
-        return False
+        Reads a plain mirror of the checkbox (kept in sync by a variable trace),
+        so scan worker threads never round-trip into Tk.
+        """
+        return self._respect_exclusions
 
-    def should_exclude_path(self, path: Path, project_root: Path) -> bool:
-        """Unified exclusion gate for BOTH files and directories.
+    def should_exclude_entry(self, entry: os.DirEntry, is_dir: bool, project_root: Path) -> bool:
+        """Exclusion gate for one os.scandir entry, file or folder (scan, map, dump, backup, export).
 
-        This centralizes the behavior so initial scan, map, dump, and backup stay consistent.
         Uses:
           - Hard excluded folders
           - Predefined + dynamic filename patterns
           - .gitignore patterns (best-effort)
           - UI toggle to disable all exclusions
+
+        Decides on entry.name / entry.path strings (no stat, no resolve); project_root
+        must be spelled exactly like the root the entries were listed under.
         """
         if not self._respect_exclusions_enabled():
             return False
 
-        try:
-            root = project_root.resolve()
-            p = path.resolve()
-        except Exception:
-            return False
-
-        # Only apply exclusions inside the active project root
-        if p != root and not str(p).startswith(str(root)):
-            return False
-
-        if p.is_dir():
-            return self.should_exclude_dir(p, root)
-
-        relp = self._rel_posix(p, root)
-        return self.should_exclude_file(p.name, rel_posix=relp)
+        if not self._name_filter(entry.name, is_dir):
+            return True
+        rx = self._gitignore_dir_rx if is_dir else self._gitignore_file_rx
+        if rx is None:
+            return False  # name rules were the whole decision
+
+        # The name filter already covered every name rule; only the .gitignore
+        # path patterns remain, matched against the relpath sliced off entry.path
+        root_str = str(project_root).rstrip(os.sep)
+        relp = entry.path[len(root_str) + 1:].replace(os.sep, "/")
+        if is_dir:
+            return rx.match(relp) is not None or rx.match(relp + "/") is not None
+        return rx.match(relp) is not None
 
     # --- Core Actions ---
+    def get_layout(self, root: Path) -> ProjectLayout | None:
+        """Derived paths for root; _logs is (re)created on every call, as it may be deleted mid-session."""
+        layout = ProjectLayout.for_root(root)
+        try: os.makedirs(layout.logs_dir, exist_ok=True)
+        except OSError: return None
+        return layout
+
     def get_log_dir(self, root: Path) -> Path | None:
         if not root: return None
         # CHANGED: All logs go directly to _logs, no subdirectories
-        d = root / LOG_ROOT_NAME
-        try: d.mkdir(parents=True, exist_ok=True)
-        except: return None
-        return d
+        layout = self.get_layout(root)
+        return Path(layout.logs_dir) if layout else None
 
     def _generate_filename(self, root_name: str, base_suffix: str, extension: str) -> str:
         # CHANGED: Naming convention logic
@@ -1055,7 +1511,7 @@ class ProjectMapperApp:
         # If timestamp enabled: FolderName_suffix_timestamp.ext
         name = f"{root_name}_{base_suffix}"
         if self.widgets['use_timestamps'].get():
-            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            ts = time.strftime('%Y%m%d_%H%M%S')
             name += f"_{ts}"
         name += extension
         return name
@@ -1068,37 +1524,106 @@ class ProjectMapperApp:
         fname = self._generate_filename(root.name, "project_folder_tree", ".txt")
         out_file = out_dir / fname
         
-        lines = [f"Project Tree: {root}\nGenerated: {datetime.now()}\n"]
+        # Walk the resolved root so entry paths are state keys; names are all
+        # that reach the output. key is curr's state key (curr resolved once a
+        # symlinked folder has been entered)
+        scan_root = self._resolved_root(root)
         
-        def _write_recurse(curr, prefix):
+        # Each line is written as it is produced (newline first, so the file ends
+        # without one), never collected into a list and joined
+        def _write_recurse(curr: str, key: str, prefix):
             if self.stop_event.is_set(): 
-                lines.append(f"{prefix}!!! CANCELLED !!!")
+                write(f"\n{prefix}!!! CANCELLED !!!")
                 return
 
-            try: items = sorted(list(curr.iterdir()), key=lambda x: (x.is_file(), x.name.lower()))
-            except: return
+            # DirEntry caches its type from the listing: the sort and the
+            # dir/file split below need no stat per entry
+            try:
+                with os.scandir(curr) as it:
+                    items = sorted(it, key=lambda e: (e.is_file(), e.name.lower()))
+            except OSError: return
             
+            # Only selected folders are descended, so curr is selected: its files
+            # are in, and a subfolder is in unless it is unchecked itself
             for i, item in enumerate(items):
                 is_last = (i == len(items) - 1)
                 conn = "└── " if is_last else "├── "
                 
-                if item.is_dir():
+                try: item_is_dir = item.is_dir()
+                except OSError: item_is_dir = False
+                if item_is_dir:
                     # Respect exclusions/.gitignore (unless toggled off)
-                    if self.should_exclude_path(item, root):
+                    if self.should_exclude_entry(item, True, scan_root):
                         continue
 
-                    if self.is_selected(item, root):
-                        lines.append(f"{prefix}{conn}📁 {item.name}/")
-                        _write_recurse(item, prefix + ("    " if is_last else "│   "))
+                    sub_key = self._selected_subdir_key(item, key, root)
+                    if sub_key is not None:
+                        write(f"\n{prefix}{conn}📁 {item.name}/")
+                        _write_recurse(item.path, sub_key, prefix + ("    " if is_last else "│   "))
                 else:
-                    if (not self.should_exclude_path(item, root)) and self.is_selected(item.parent, root):
-                         lines.append(f"{prefix}{conn}📄 {item.name}")
+                    if not self.should_exclude_entry(item, False, scan_root):
+                        write(f"\n{prefix}{conn}📄 {item.name}")
         
-        _write_recurse(root, "")
-        
-        with open(out_file, "w", encoding="utf-8") as f: f.write("\n".join(lines))
+        with open(out_file, "w", encoding="utf-8", buffering=TREE_MAP_WRITE_BUFFER_BYTES) as f:
+            write = f.write
+            write(f"Project Tree: {root}\nGenerated: {datetime.now()}\n")
+            if self.is_selected(scan_root, root):
+                _write_recurse(str(scan_root), str(scan_root), "")
         self.schedule_log_message(f"Tree saved: {fname}")
 
+    def _iter_selected_files(self, root: Path):
+        """Yield (entry, rel, size_bytes) for selected, non-excluded files under root (dump and backup).
+
+        entry is the os.DirEntry (open entry.path, filter on entry.name); rel is
+        its path relative to root, sliced from the entry path rather than built
+        with Path.relative_to. Same order as os.walk (top-down, a folder's files
+        before its subfolders). Sizes come from the scandir entry; size_bytes is
+        None if the stat failed. Only selected folders are descended, so a
+        subfolder's selection is just its own state; nothing walks back up to
+        the root per entry.
+        """
+        # Walk the resolved root so entry paths match the state keys
+        scan_root = self._resolved_root(root)
+        scan_str = str(scan_root)
+        cut = len(os.path.join(scan_str, ""))
+        if not self.is_selected(scan_root, root): return
+        states = self.folder_item_states
+
+        stack = [scan_str]
+        while stack:
+            if self.stop_event.is_set(): return
+            curr = stack.pop()
+            try:
+                with os.scandir(curr) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            files, subdirs = [], []
+            for e in entries:
+                try: is_dir = e.is_dir()
+                except OSError: is_dir = False
+                (subdirs if is_dir else files).append(e)
+
+            # First remove excluded folders (hard + .gitignore), then apply selection logic
+            kept_dirs = []
+            for e in subdirs:
+                if self.should_exclude_entry(e, True, scan_root):
+                    continue
+                if states.get(e.path) == S_UNCHECKED:
+                    continue
+                if not e.is_symlink():  # like os.walk: list symlinked folders, never descend
+                    kept_dirs.append(e.path)
+            stack.extend(reversed(kept_dirs))
+
+            for e in files:
+                if self.stop_event.is_set(): return
+                if self.should_exclude_entry(e, False, scan_root):
+                    continue
+                try: size_bytes = e.stat().st_size
+                except OSError: size_bytes = None
+                yield e, e.path[cut:], size_bytes
+
     def dump_files_impl(self):
         root = self._get_current_project_path()
         if not root: return
@@ -1108,46 +1633,54 @@ class ProjectMapperApp:
         out_file = out_dir / fname
         
         count = 0
-        with open(out_file, "w", encoding="utf-8") as f_out:
+
+        def _write_result(rel: str, future):
+            nonlocal count
+            content, error = future.result()
+            if content is None and error is None:
+                return  # skipped: binary content
+
+            if count % 5 == 0: self.schedule_log_message(f"Dumping: {rel}", "DEBUG")
+
+            f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n")
+            if error is not None:
+                f_out.write(f"\n[ERROR READING FILE: {error}]\n")
+                return
+            f_out.write(content)
+            count += 1
+
+        # Reader pool keeps several file reads in flight; this thread is the single
+        # writer and consumes results in walk order through a bounded read-ahead window.
+        window = deque()
+        window_bytes = 0
+        with ThreadPoolExecutor(max_workers=DUMP_READ_WORKERS, thread_name_prefix="dump_read") as pool, \
+                open(out_file, "w", encoding="utf-8", buffering=DUMP_WRITE_BUFFER_BYTES) as f_out:
             f_out.write(f"Dump: {root}\n\n")
-            
-            for r, d, f in os.walk(root):
-                if self.stop_event.is_set(): 
-                    f_out.write("\n\n!!! DUMP CANCELLED BY USER !!!")
-                    break
-    
-                curr = Path(r)
-                # First remove excluded folders (hard + .gitignore), then apply selection logic
-                kept_dirs = []
-                for x in d:
-                    dp = curr / x
-                    if self.should_exclude_path(dp, root):
-                        continue
-                    if not self.is_selected(dp, root):
-                        continue
-                    kept_dirs.append(x)
-                d[:] = kept_dirs
-                if not self.is_selected(curr, root): continue
-                
-                for fname_item in f:
-                    if self.stop_event.is_set(): break
 
-                    fpath = curr / fname_item
-                    if self.should_exclude_path(fpath, root):
-                        continue
-                    if fpath.stat().st_size > 1_000_000: continue
-                    if is_binary(fpath) or "".join(fpath.suffixes).lower() in FORCE_BINARY_EXTENSIONS_FOR_DUMP: continue
-                    
-                    rel = fpath.relative_to(root)
-                    if count % 5 == 0: self.schedule_log_message(f"Dumping: {rel}", "DEBUG")
-                    
-                    try:
-                        f_out.write(f"\n{'-'*80}\nFILE: {rel}\n{'-'*80}\n")
-                        with open(fpath, "r", encoding="utf-8", errors="ignore") as f_in:
-                            f_out.write(f_in.read())
-                        count += 1
-                    except Exception as e:
-                        f_out.write(f"\n[ERROR READING FILE: {e}]\n")
+            for entry, rel, size_bytes in self._iter_selected_files(root):
+                if _is_binary_ext(entry.name):
+                    continue
+                if size_bytes is not None and size_bytes > MAX_DUMP_FILE_BYTES:
+                    self.schedule_log_message(
+                        f"Skipped large file ({format_display_size(size_bytes)}): {rel}",
+                        "WARNING",
+                    )
+                    continue
+                window.append((rel, size_bytes or 0, pool.submit(read_text_for_dump, entry.path)))
+                window_bytes += size_bytes or 0
+                while window and (len(window) >= DUMP_READ_AHEAD or window_bytes > DUMP_READ_AHEAD_BYTES):
+                    done_rel, done_bytes, fut = window.popleft()
+                    window_bytes -= done_bytes
+                    _write_result(done_rel, fut)
+                if self.stop_event.is_set(): break
+
+            while window and not self.stop_event.is_set():
+                done_rel, _, fut = window.popleft()
+                _write_result(done_rel, fut)
+
+            if self.stop_event.is_set():
+                for _, _, fut in window: fut.cancel()
+                f_out.write("\n\n!!! DUMP CANCELLED BY USER !!!")
         
         self.schedule_log_message(f"Dump saved: {fname} ({count} files)")
 
@@ -1167,6 +1700,7 @@ class ProjectMapperApp:
                 return
 
         created_at = datetime.now().isoformat(timespec="seconds")
+        folder_sizes: dict[str, int] = {}  # this export's folder totals
         dumped_file_count = 0
         tree_entry_count = 0
         cancelled = False
@@ -1249,7 +1783,7 @@ class ProjectMapperApp:
                     "export_format_version": "1.1",
                     "respect_exclusions": int(self._respect_exclusions_enabled()),
                     "timestamps_enabled": int(self.widgets['use_timestamps'].get()),
-                    "max_dump_file_size_bytes": 1_000_000,
+                    "max_dump_file_size_bytes": MAX_DUMP_FILE_BYTES,
                     "dump_encoding": "utf-8",
                     "manifest_table": "export_manifest",
                     "manifest_artifact_name": "agent_manifest_markdown",
@@ -1260,11 +1794,20 @@ class ProjectMapperApp:
                 tree_lines = [f"Project Tree: {root}\nGenerated: {created_at}\n"]
                 tree_order = 0
 
-                def insert_tree_row(path: Path, parent_rel: str | None, entry_type: str, is_selected: bool):
+                # The tree walk runs under the resolved root: entry paths are then
+                # state keys, and relative paths are sliced off them
+                scan_root = self._resolved_root(root)
+                scan_str = str(scan_root)
+                cut = len(os.path.join(scan_str, ""))
+
+                def rel_of(path_str: str) -> str:
+                    return "." if path_str == scan_str else path_str[cut:].replace(os.sep, "/")
+
+                def insert_tree_row(path_str: str, name: str, parent_rel: str | None, entry_type: str, is_selected: bool):
                     nonlocal tree_entry_count, tree_order
-                    rel = "." if path == root else self._rel_posix(path, root)
+                    rel = rel_of(path_str)
                     try:
-                        size_bytes = get_folder_size_bytes(path) if path.is_dir() else path.stat().st_size
+                        size_bytes = get_folder_size_bytes(path_str, folder_sizes) if entry_type == "dir" else os.stat(path_str).st_size
                     except OSError:
                         size_bytes = None
 
@@ -1280,7 +1823,7 @@ class ProjectMapperApp:
                             tree_order,
                             rel,
                             parent_rel,
-                            path.name,
+                            name,
                             entry_type,
                             depth,
                             size_bytes,
@@ -1291,36 +1834,47 @@ class ProjectMapperApp:
                     tree_entry_count += 1
                     return rel
 
-                insert_tree_row(root, None, "dir", True)
+                insert_tree_row(scan_str, root.name, None, "dir", True)
+
+                # Selection is carried down the walk: only selected folders are
+                # descended, so a folder's files are in and a subfolder is in
+                # unless it is unchecked itself (symlinked folders are resolved;
+                # key is curr's state key)
+                root_selected = self.is_selected(root, root)
 
-                def walk_tree(curr: Path, prefix: str):
+                def walk_tree(curr: str, key: str, prefix: str):
                     nonlocal cancelled
                     if self.stop_event.is_set():
                         cancelled = True
                         tree_lines.append(f"{prefix}!!! CANCELLED !!!")
                         return
 
+                    # scandir entries cache their d_type, and exclusion is decided on
+                    # entry.name / entry.path strings: no stat or resolve per item
+                    # (sizes for the rows are read separately)
                     try:
-                        items = sorted(list(curr.iterdir()), key=lambda x: (x.is_file(), x.name.lower()))
+                        with os.scandir(curr) as it:
+                            entries = sorted(it, key=lambda e: (e.is_file(), e.name.lower()))
                     except Exception:
                         return
 
                     visible_items = []
-                    for item in items:
-                        if item.is_dir():
-                            if self.should_exclude_path(item, root):
-                                continue
-                            if not self.is_selected(item, root):
-                                continue
-                        else:
-                            if self.should_exclude_path(item, root):
-                                continue
-                            if not self.is_selected(item.parent, root):
+                    for entry in entries:
+                        try:
+                            item_is_dir = entry.is_dir()
+                        except OSError:
+                            item_is_dir = False
+                        if self.should_exclude_entry(entry, item_is_dir, scan_root):
+                            continue
+                        sub_key = None
+                        if item_is_dir:
+                            sub_key = self._selected_subdir_key(entry, key, root)
+                            if sub_key is None:
                                 continue
-                        visible_items.append(item)
+                        visible_items.append((entry, item_is_dir, sub_key))
 
-                    parent_rel = "." if curr == root else self._rel_posix(curr, root)
-                    for i, item in enumerate(visible_items):
+                    parent_rel = rel_of(curr)
+                    for i, (item, item_is_dir, sub_key) in enumerate(visible_items):
                         if self.stop_event.is_set():
                             cancelled = True
                             tree_lines.append(f"{prefix}!!! CANCELLED !!!")
@@ -1329,92 +1883,72 @@ class ProjectMapperApp:
                         is_last = i == len(visible_items) - 1
                         connector = "└── " if is_last else "├── "
 
-                        if item.is_dir():
-                            insert_tree_row(item, parent_rel, "dir", True)
+                        if item_is_dir:
+                            insert_tree_row(item.path, item.name, parent_rel, "dir", True)
                             tree_lines.append(f"{prefix}{connector}📁 {item.name}/")
-                            walk_tree(item, prefix + ("    " if is_last else "│   "))
+                            walk_tree(item.path, sub_key, prefix + ("    " if is_last else "│   "))
                         else:
-                            insert_tree_row(item, parent_rel, "file", True)
+                            insert_tree_row(item.path, item.name, parent_rel, "file", True)
                             tree_lines.append(f"{prefix}{connector}📄 {item.name}")
 
-                walk_tree(root, "")
+                if root_selected:
+                    walk_tree(scan_str, scan_str, "")
                 conn.execute(
                     "INSERT OR REPLACE INTO export_artifacts (name, content) VALUES (?, ?)",
                     ("project_tree_text", "\n".join(tree_lines)),
                 )
                 conn.commit()
 
-                for r, d, f in os.walk(root):
-                    if self.stop_event.is_set():
-                        cancelled = True
-                        break
-
-                    curr = Path(r)
-                    kept_dirs = []
-                    for dirname in d:
-                        dir_path = curr / dirname
-                        if self.should_exclude_path(dir_path, root):
-                            continue
-                        if not self.is_selected(dir_path, root):
-                            continue
-                        kept_dirs.append(dirname)
-                    d[:] = kept_dirs
-
-                    if not self.is_selected(curr, root):
+                # Same scandir walk as the dump and backup: selection checked once
+                # for the root, exclusions decided on the entries
+                for entry, rel_native, _ in self._iter_selected_files(root):
+                    rel = rel_native.replace(os.sep, "/")
+                    try:
+                        st = entry.stat()  # already cached by the walk's size read
+                        size_bytes = st.st_size
+                    except OSError as e:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO export_errors (relative_path, error) VALUES (?, ?)",
+                            (rel, f"stat failed: {e}"),
+                        )
                         continue
 
-                    for fname_item in f:
-                        if self.stop_event.is_set():
-                            cancelled = True
-                            break
-
-                        fpath = curr / fname_item
-                        if self.should_exclude_path(fpath, root):
-                            continue
-
-                        try:
-                            size_bytes = fpath.stat().st_size
-                        except OSError as e:
-                            conn.execute(
-                                "INSERT OR REPLACE INTO export_errors (relative_path, error) VALUES (?, ?)",
-                                (self._rel_posix(fpath, root), f"stat failed: {e}"),
-                            )
-                            continue
+                    if size_bytes > MAX_DUMP_FILE_BYTES:
+                        continue
+                    if _is_binary_ext(entry.name) or is_binary_cached(entry.path, st.st_mtime_ns, size_bytes):
+                        continue
 
-                        if size_bytes > 1_000_000:
-                            continue
-                        if is_binary(fpath) or "".join(fpath.suffixes).lower() in FORCE_BINARY_EXTENSIONS_FOR_DUMP:
-                            continue
+                    if dumped_file_count % 5 == 0:
+                        self.schedule_log_message(f"Exporting to SQLite: {rel}", "DEBUG")
 
-                        rel = self._rel_posix(fpath, root)
-                        if dumped_file_count % 5 == 0:
-                            self.schedule_log_message(f"Exporting to SQLite: {rel}", "DEBUG")
+                    try:
+                        with open(entry.path, "r", encoding="utf-8", errors="ignore") as f_in:
+                            content = f_in.read()
+                        conn.execute(
+                            """
+                            INSERT OR REPLACE INTO project_files (
+                                dump_order, relative_path, parent_relative_path, size_bytes, content
+                            ) VALUES (?, ?, ?, ?, ?)
+                            """,
+                            (
+                                dumped_file_count,
+                                rel,
+                                rel.rpartition("/")[0] or ".",
+                                size_bytes,
+                                content,
+                            ),
+                        )
+                        dumped_file_count += 1
+                        if dumped_file_count % 25 == 0:
+                            conn.commit()
+                    except Exception as e:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO export_errors (relative_path, error) VALUES (?, ?)",
+                            (rel, str(e)),
+                        )
 
-                        try:
-                            with open(fpath, "r", encoding="utf-8", errors="ignore") as f_in:
-                                content = f_in.read()
-                            conn.execute(
-                                """
-                                INSERT OR REPLACE INTO project_files (
-                                    dump_order, relative_path, parent_relative_path, size_bytes, content
-                                ) VALUES (?, ?, ?, ?, ?)
-                                """,
-                                (
-                                    dumped_file_count,
-                                    rel,
-                                    "." if curr == root else self._rel_posix(curr, root),
-                                    size_bytes,
-                                    content,
-                                ),
-                            )
-                            dumped_file_count += 1
-                            if dumped_file_count % 25 == 0:
-                                conn.commit()
-                        except Exception as e:
-                            conn.execute(
-                                "INSERT OR REPLACE INTO export_errors (relative_path, error) VALUES (?, ?)",
-                                (rel, str(e)),
-                            )
+                if self.stop_event.is_set():
+                    cancelled = True
 
                 upsert_metadata(conn, "tree_entry_count", tree_entry_count)
                 upsert_metadata(conn, "dumped_file_count", dumped_file_count)
@@ -1448,7 +1982,7 @@ class ProjectMapperApp:
                     "## Inclusion Rules",
                     "- Selection follows the checkbox state in the ProjectMapper tree.",
                     "- If `respect_exclusions` is `1`, `.gitignore`, hard exclusions, and dynamic filename exclusions were applied.",
-                    "- `project_files` only includes text-readable files at or below `1000000` bytes.",
+                    f"- `project_files` only includes text-readable files at or below `{MAX_DUMP_FILE_BYTES}` bytes.",
                     "- Binary-like files and known database/archive/media formats are skipped from `project_files`.",
                     "- The root path is represented as `.` in relative-path columns.",
                     "",
@@ -1518,36 +2052,116 @@ class ProjectMapperApp:
             if conn is not None:
                 conn.close()
 
+    def _add_selected_to_tar(self, tar: tarfile.TarFile, root: Path, out_file: Path) -> int:
+        """Add every selected, non-excluded file under root to tar; returns the file count.
+
+        out_file is the archive being written. A tar streamed into a compressor has
+        no name, so tarfile can't skip its own output the way tar.add does for a
+        named archive; it is skipped here (it lives in _logs, walked when
+        exclusions are off).
+
+        Small regular files are read on a pool (the dump's reader count) while this
+        thread archives earlier ones, so disk reads overlap compression. Headers and
+        writes stay here, in walk order: tarfile is not thread-safe. Large files,
+        symlinks, and anything whose read-ahead failed or changed size go through
+        tar.add as before.
+        """
+        count = 0
+        skip_path = str(out_file.resolve())
+
+        def _archive(entry, rel, future):
+            nonlocal count
+            data = None
+            if future is not None:
+                try: data = future.result()
+                except OSError: data = None  # tar.add below retries and reports it
+            tarinfo = tar.gettarinfo(entry.path, arcname=rel) if data is not None else None
+            if tarinfo is not None and tarinfo.isreg() and tarinfo.size == len(data):
+                tar.addfile(tarinfo, io.BytesIO(data))
+            else:
+                tar.add(entry.path, arcname=rel, recursive=False)
+            count += 1
+            if count % 10 == 0: self.schedule_log_message(f"Archiving: {entry.name}", "DEBUG")
+
+        window = deque()
+        window_bytes = 0
+        with ThreadPoolExecutor(max_workers=DUMP_READ_WORKERS, thread_name_prefix="backup_read") as pool:
+            try:
+                for entry, rel, size_bytes in self._iter_selected_files(root):
+                    if entry.path == skip_path:
+                        continue  # never read, let alone archived
+                    if (size_bytes is None or size_bytes > BACKUP_READ_AHEAD_MAX_FILE_BYTES
+                            or entry.is_symlink()):
+                        size_bytes, future = 0, None
+                    else:
+                        future = pool.submit(read_file_bytes, entry.path)
+                    window.append((entry, rel, size_bytes, future))
+                    window_bytes += size_bytes
+                    while window and (len(window) >= BACKUP_READ_AHEAD or window_bytes > BACKUP_READ_AHEAD_BYTES):
+                        done_entry, done_rel, done_bytes, fut = window.popleft()
+                        window_bytes -= done_bytes
+                        _archive(done_entry, done_rel, fut)
+                while window and not self.stop_event.is_set():
+                    done_entry, done_rel, _, fut = window.popleft()
+                    _archive(done_entry, done_rel, fut)
+            finally:
+                for *_, fut in window:
+                    if fut is not None: fut.cancel()
+        return count
+
+    def _backup_via_zstd(self, out_file: Path, root: Path):
+        """Stream the tar through zstandard; threads=-1 compresses on every core."""
+        cctx = zstandard.ZstdCompressor(level=BACKUP_ZSTD_LEVEL, threads=-1)
+        with open(out_file, "wb", buffering=BACKUP_WRITE_BUFFER_BYTES) as f_out, \
+                cctx.stream_writer(f_out) as zw, \
+                tarfile.open(fileobj=zw, mode="w|", bufsize=BACKUP_TAR_BUFSIZE,
+                             copybufsize=BACKUP_TAR_BUFSIZE) as tar:
+            self._add_selected_to_tar(tar, root, out_file)
+
+    def _backup_via_external_gzip(self, out_file: Path, root: Path) -> bool:
+        """Write raw tar into a pigz/gzip child so compression runs on other cores.
+
+        Returns False if the compressor could not be started (caller falls back).
+        """
+        with open(out_file, "wb") as f_out:
+            try:
+                proc = subprocess.Popen(
+                    [self.external_gzip, "-c"],
+                    stdin=subprocess.PIPE, stdout=f_out, stderr=subprocess.DEVNULL,
+                    creationflags=_NO_WINDOW,
+                )
+            except OSError:
+                return False
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|", bufsize=BACKUP_TAR_BUFSIZE,
+                                  copybufsize=BACKUP_TAR_BUFSIZE) as tar:
+                    self._add_selected_to_tar(tar, root, out_file)
+            finally:
+                proc.stdin.close()
+                rc = proc.wait()
+        if rc != 0:
+            raise RuntimeError(f"{Path(self.external_gzip).name} exited with code {rc}")
+        return True
+
     def backup_project_impl(self):
         root = self._get_current_project_path()
         if not root: return
         
         out_dir = self.get_log_dir(root)
-        fname = self._generate_filename(root.name, "backup", ".tar.gz")
+        use_zstd = zstandard is not None
+        fname = self._generate_filename(root.name, "backup", ".tar.zst" if use_zstd else ".tar.gz")
         out_file = out_dir / fname
-        
-        count = 0
-        with tarfile.open(out_file, "w:gz") as tar:
-            for r, d, f in os.walk(root):
-                if self.stop_event.is_set(): break
-                curr = Path(r)
-                kept_dirs = []
-                for x in d:
-                    dp = curr / x
-                    if self.should_exclude_path(dp, root):
-                        continue
-                    if not self.is_selected(dp, root):
-                        continue
-                    kept_dirs.append(x)
-                d[:] = kept_dirs
-                if not self.is_selected(curr, root): continue
-                for fname_item in f:
-                    fpath = curr / fname_item
-                    if self.should_exclude_path(fpath, root):
-                        continue
-                    tar.add(fpath, arcname=fpath.relative_to(root))
-                    count += 1
-                    if count % 10 == 0: self.schedule_log_message(f"Archiving: {fname_item}", "DEBUG")
+
+        if use_zstd:
+            self._backup_via_zstd(out_file, root)
+        elif not (self.external_gzip and self._backup_via_external_gzip(out_file, root)):
+            # In-process fallback. Stream mode ("w|gz") never seeks back; large buffers
+            # coalesce the many small header/data writes into few physical writes.
+            with open(out_file, "wb", buffering=0) as raw, \
+                    io.BufferedWriter(raw, buffer_size=BACKUP_WRITE_BUFFER_BYTES) as buf, \
+                    tarfile.open(fileobj=buf, mode="w|gz", bufsize=BACKUP_TAR_BUFSIZE,
+                                 copybufsize=BACKUP_TAR_BUFSIZE) as tar:
+                self._add_selected_to_tar(tar, root, out_file)
 
         if self.stop_event.is_set():
             self.schedule_log_message("Backup Cancelled.", "WARNING")
@@ -1578,46 +2192,104 @@ class ProjectMapperApp:
         
         self.schedule_log_message(f"Auditing Conda Env: {env_name}...")
         try:
-            res = subprocess.run(["conda", "list", "-n", env_name], capture_output=True, text=True, shell=True)
-            with open(out_file, "w") as f: f.write(res.stdout)
+            conda = conda_executable()
+            if not conda: raise FileNotFoundError("conda executable not found")
+            env_path = self.conda_env_paths.get(env_name)
+            meta_dir = Path(env_path) / "conda-meta" if env_path else None
+            out = cached_audit(f"conda_list:{env_name}", meta_dir, [conda, "list", "-n", env_name])
+            with open(out_file, "w") as f: f.write(out)
             self.schedule_log_message(f"Conda audit saved: {fname}")
         except Exception as e:
             self.schedule_log_message(f"Conda audit failed: {e}", "ERROR")
 
     def _load_conda_info_impl(self):
         try:
-            res = subprocess.run(["conda", "env", "list", "--json"], capture_output=True, text=True, shell=True)
-            data = json.loads(res.stdout)
-            envs = [Path(p).name for p in data.get('envs', [])]
+            conda = conda_executable()
+            if not conda: return
+            out = cached_audit("conda_env_list", CONDA_ENVIRONMENTS_TXT, [conda, "env", "list", "--json"])
+            data = json.loads(out)
+            self.conda_env_paths = {Path(p).name: p for p in data.get('envs', [])}
+            envs = list(self.conda_env_paths)
             self.gui_queue.put(lambda: self.widgets['conda_env_combo'].config(values=envs))
             if envs: self.gui_queue.put(lambda: self.widgets['conda_env_combo'].current(0))
         except: pass
 
     # --- Persistence ---
+    def _schedule_config_save(self):
+        """Debounced save: a burst of selection/exclusion changes becomes one write."""
+        root_str = self._states_root
+        if root_str is None: return
+        with self._config_save_lock:
+            if self._config_save_timer is not None:
+                self._config_save_timer.cancel()
+            timer = threading.Timer(CONFIG_SAVE_DEBOUNCE_SECONDS, self.save_project_config, args=(Path(root_str),))
+            timer.daemon = True
+            self._config_save_timer = timer
+            timer.start()
+
+    def _flush_config_save(self):
+        """Run a pending debounced save now (before switching roots or exiting)."""
+        with self._config_save_lock:
+            timer, self._config_save_timer = self._config_save_timer, None
+        if timer is not None and not timer.finished.is_set():
+            timer.cancel()
+            self.save_project_config(*timer.args)
+
     def save_project_config(self, root: Path):
-        cfg = self.get_log_dir(root) / PROJECT_CONFIG_FILENAME
+        root = root.resolve()
         rel_states = {}
         with self.state_lock:
+            # States belong to the last scanned root; never write them into another root's config
+            if self._states_root is not None and str(root) != self._states_root:
+                return
+            # Keys are absolute path strings under root: slice, don't build a Path per key
+            root_str = str(root)
+            prefix = os.path.join(root_str, "")
+            cut = len(prefix)
             for k, v in self.folder_item_states.items():
-                try: rel_states[str(Path(k).relative_to(root))] = v
-                except: pass
+                if k.startswith(prefix): rel_states[k[cut:]] = v
+                elif k == root_str: rel_states["."] = v
             data = {
                 "folder_states": rel_states,
-                "dynamic_exclusions": list(self.dynamic_global_excluded_filenames)
+                "dynamic_exclusions": sorted(self.dynamic_global_excluded_filenames)
             }
-        with open(cfg, "w") as f: json.dump(data, f, indent=2)
+        if orjson is not None:
+            blob = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        else:
+            blob = json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+
+        layout = self.get_layout(root)
+        if not layout: return
+        cfg = Path(layout.config_path)
+        with self._config_write_lock:
+            if self._last_config_blob == (str(cfg), blob):
+                return
+            # Write a sibling then swap it in, so a crash never leaves a truncated config
+            tmp = cfg.with_name(cfg.name + ".tmp")
+            with open(tmp, "wb") as f: f.write(blob)
+            os.replace(tmp, cfg)
+            self._last_config_blob = (str(cfg), blob)
 
     def load_project_config(self, root: Path):
         # Always (re)load .gitignore for the active root (best-effort)
         self._load_gitignore_patterns(root)
 
-        cfg = self.get_log_dir(root) / PROJECT_CONFIG_FILENAME
+        layout = self.get_layout(root)
+        if not layout: return
+        cfg = Path(layout.config_path)
         if not cfg.exists(): return
         try:
-            with open(cfg, "r") as f: data = json.load(f)
+            with open(cfg, "rb") as f: raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            # Same spelling as the scan's iids: resolved root + relative key, no per-key resolve
+            root_str = str(root.resolve())
             for k, v in data.get("folder_states", {}).items():
-                self.folder_item_states[str((root / k).resolve())] = v
+                st = STATE_VALUES.get(v)
+                if st is None: continue
+                self.folder_item_states[sys.intern(os.path.normpath(os.path.join(root_str, k)))] = st
+            self._invalidate_selection_cache()
             self.dynamic_global_excluded_filenames.update(data.get("dynamic_exclusions", []))
+            self._rebuild_exclusion_matchers()
         except: pass
 
     # --- Dynamic Exclusions ---
@@ -1625,6 +2297,8 @@ class ProjectMapperApp:
         val = entry.get().strip()
         if val:
             self.dynamic_global_excluded_filenames.add(val)
+            self._rebuild_exclusion_matchers()
+            self._schedule_config_save()
             entry.delete(0, tk.END)
             self.schedule_log_message(f"Added exclusion: {val}")
 
@@ -1640,14 +2314,16 @@ class ProjectMapperApp:
             selectforeground=THEME["heading_text"],
         )
         lb.pack(fill=tk.BOTH, expand=True)
-        for x in self.dynamic_global_excluded_filenames: lb.insert(tk.END, x)
+        # One insert call for every row; the Listbox itself only draws what is visible
+        lb.insert(tk.END, *sorted(self.dynamic_global_excluded_filenames))
         def _rem():
             sel = lb.curselection()
             if not sel: return
-            val = lb.get(sel[0])
-            self.dynamic_global_excluded_filenames.remove(val)
-            top.destroy()
-            self.manage_dynamic_exclusions_popup()
+            for i in reversed(sel):
+                self.dynamic_global_excluded_filenames.discard(lb.get(i))
+                lb.delete(i)  # in place: no popup rebuild per removal
+            self._rebuild_exclusion_matchers()
+            self._schedule_config_save()
         tk.Button(
             top,
             text="Remove Selected",
@@ -1662,9 +2338,20 @@ class ProjectMapperApp:
         p = self._get_current_project_path()
         if not p: return
         d = self.get_log_dir(p)
-        if platform.system() == "Windows": os.startfile(d)
-        elif platform.system() == "Darwin": subprocess.run(["open", d])
-        else: subprocess.run(["xdg-open", d])
+        if platform.system() == "Windows":
+            os.startfile(d)
+            return
+        # Fire and forget: xdg-open/open can take a while (DBus, app launch) and
+        # this runs on the Tk thread
+        opener = "open" if platform.system() == "Darwin" else "xdg-open"
+        try:
+            subprocess.Popen(
+                [opener, str(d)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as e:
+            self.schedule_log_message(f"Could not open log folder: {e}", "ERROR")
 
 
 # ==============================================================================
@@ -1672,8 +2359,13 @@ class ProjectMapperApp:
 # ==============================================================================
 
 def run_gui():
+    load_audit_cache()
+    # Exit hooks instead of code after mainloop(): they also run when the process
+    # leaves through sys.exit() or an uncaught exception. LIFO: config first.
+    atexit.register(save_audit_cache)
     root = tk.Tk()
     app = ProjectMapperApp(root)
+    atexit.register(app._flush_config_save)
     root.mainloop()
 
 def run_cli():